@@ -4,18 +4,24 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
+from homeassistant.helpers.storage import Store
 
 from .const import DOMAIN
-from .coordinator import OctopusEnergyCoordinator
+from .coordinator import STORAGE_VERSION, OctopusEnergyCoordinator
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.EVENT]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Octopus Energy Tariff Comparison from a config entry."""
-    coordinator = OctopusEnergyCoordinator(hass, entry.data)
+    coordinator = OctopusEnergyCoordinator(hass, entry)
     
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Release the client's session and worker threads before setup is retried
+        coordinator.api.close()
+        raise
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -28,6 +34,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.api.close()
+        await coordinator.async_flush_stored_data()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, OctopusEnergyCoordinator.storage_key(entry.entry_id)).async_remove()
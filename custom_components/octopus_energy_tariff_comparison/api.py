@@ -3,15 +3,223 @@ from __future__ import annotations
 
 import base64
 import logging
-from datetime import date, datetime, time
-from typing import Any, Dict, List, Tuple
+import re
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache, partial
+from operator import mul
+from time import monotonic
+from typing import Any, Callable, Dict, List, Tuple
+from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
-from .const import GRAPHQL_URL, REST_BASE_URL, TARIFFS_TO_COMPARE
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
+
+from .const import (
+    GRAPHQL_URL,
+    PRODUCT_DETAILS_CACHE_TTL,
+    PRODUCTS_CACHE_TTL,
+    RATES_UPDATE_INTERVAL_HOURS,
+    REST_BASE_URL,
+    TARIFF_KEYS,
+    TARIFFS_TO_COMPARE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+UK_TZ = ZoneInfo("Europe/London")
+
+HALF_HOUR = timedelta(minutes=30)
+HALF_HOUR_SECONDS = 30 * 60
+
+# Maximum number of REST responses kept for conditional revalidation
+ETAG_CACHE_SIZE = 32
+
+# Obtain a new Kraken token when the cached one expires within this many seconds
+KRAKEN_TOKEN_EXPIRY_MARGIN = 120
+
+# Tariff code keywords mapped to tariff names
+TARIFF_KEYWORDS = {
+    "AGILE": "Agile Octopus",
+    "GO": "Octopus Go",
+    "COSY": "Cosy Octopus",
+    "FLEX": "Flexible Octopus",
+}
+TARIFF_KEYWORDS_RE = re.compile("|".join(TARIFF_KEYWORDS), re.IGNORECASE)
+
+# Keyword of each compared tariff (e.g. "GO" for Octopus Go), classified once
+TARIFF_KINDS = {
+    tariff: match.group(0).upper() if (match := TARIFF_KEYWORDS_RE.search(tariff)) else None
+    for tariff in TARIFFS_TO_COMPARE
+}
+
+# GraphQL selections and operations, parameterized with variables so the query text never changes
+KRAKEN_TOKEN_MUTATION = """
+mutation obtainKrakenToken($input: ObtainJSONWebTokenInput!) {
+    obtainKrakenToken(input: $input) {
+        token
+    }
+}
+"""
+
+ACCOUNT_QUERY_FIELD = """
+    account(accountNumber: $accountNumber) {
+        electricityAgreements(active: true) {
+            validFrom
+            validTo
+            meterPoint {
+                meters(includeInactive: false) {
+                    smartDevices {
+                        deviceId
+                    }
+                }
+                mpan
+                direction
+            }
+            tariff {
+                ... on HalfHourlyTariff {
+                    id
+                    productCode
+                    tariffCode
+                    standingCharge
+                }
+            }
+        }
+    }
+"""
+
+CONSUMPTION_QUERY_FIELD = """
+    smartMeterTelemetry(
+        deviceId: $deviceId
+        grouping: HALF_HOURLY
+        start: $start
+        end: $end
+    ) {
+        readAt
+        consumptionDelta
+        costDeltaWithTax
+    }
+"""
+
+ACCOUNT_QUERY = f"""
+query Account($accountNumber: String!) {{{ACCOUNT_QUERY_FIELD}}}
+"""
+
+CONSUMPTION_QUERY = f"""
+query Consumption($deviceId: String!, $start: DateTime!, $end: DateTime!) {{{CONSUMPTION_QUERY_FIELD}}}
+"""
+
+ACCOUNT_AND_CONSUMPTION_QUERY = f"""
+query AccountAndConsumption(
+    $accountNumber: String!
+    $deviceId: String!
+    $start: DateTime!
+    $end: DateTime!
+) {{{ACCOUNT_QUERY_FIELD}{CONSUMPTION_QUERY_FIELD}}}
+"""
+
+
+# Unit rate as (valid_from, valid_to or None, is DIRECT_DEBIT, value_inc_vat), with times in epoch seconds
+UnitRate = Tuple[int, int | None, bool, float]
+
+
+@lru_cache(maxsize=1024)
+def _iso_to_epoch(value: str) -> int:
+    """Convert an ISO 8601 timestamp to Unix epoch seconds."""
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+def _parse_unit_rates(results: List[Dict]) -> List[UnitRate]:
+    """Parse REST unit rates once into UnitRate tuples, skipping any without a valid_from."""
+    return [
+        (
+            _iso_to_epoch(rate["valid_from"]),
+            _iso_to_epoch(rate["valid_to"]) if rate.get("valid_to") is not None else None,
+            rate.get("payment_method") == "DIRECT_DEBIT",
+            float(rate["value_inc_vat"]),
+        )
+        for rate in results
+        if rate.get("valid_from")
+    ]
+
+
+def _unit_rates_ttl(period_to: int, response: Dict) -> float:
+    """Get how long (in seconds) to cache a unit rates response for a window ending at period_to.
+    
+    Once a rate with an explicit valid_to reaches the end of the window (i.e. tomorrow's rates
+    are published) the window's rates won't change, so they only need refreshing daily.
+    Open-ended rates (valid_to=null) can still be superseded, so they aren't cached.
+    """
+    if any(
+        rate.get("valid_to") is not None and _iso_to_epoch(rate["valid_to"]) >= period_to
+        for rate in response.get("results", [])
+    ):
+        return RATES_UPDATE_INTERVAL_HOURS * 60 * 60
+    return 0
+
+
+def _jwt_expiry(token: str) -> float:
+    """Read the expiry (epoch seconds) from a JWT's payload without verifying it, or 0 if unknown."""
+    try:
+        payload = token.split(".")[1]
+        claims = json_loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+
+def _is_auth_error(errors: List[Dict]) -> bool:
+    """Check if GraphQL errors report a missing, expired or invalid Kraken token."""
+    return any(
+        (error.get("extensions") or {}).get("errorType") == "AUTHORIZATION"
+        for error in errors if isinstance(error, dict)
+    )
+
+
+def _format_utc(value: datetime) -> str:
+    """Format an aware datetime as an ISO 8601 UTC timestamp with a Z suffix."""
+    utc = value.astimezone(timezone.utc)
+    return f"{utc.year:04d}-{utc.month:02d}-{utc.day:02d}T{utc.hour:02d}:{utc.minute:02d}:{utc.second:02d}Z"
+
+
+def _uk_half_hour_slot(timestamp: int) -> int:
+    """Get the half-hour slot of the day (hour * 2 + minute // 30) in UK time for an epoch timestamp."""
+    uk_time = datetime.fromtimestamp(timestamp, UK_TZ)
+    return uk_time.hour * 2 + uk_time.minute // 30
+
+
+def _event_periods(start_of_today: datetime) -> List[Tuple[int, str, str]]:
+    """Get the (start epoch seconds, start ISO, end ISO) half-hours of today and tomorrow from UTC midnight."""
+    starts = [start_of_today + HALF_HOUR * i for i in range(2 * 48 + 1)]
+    isos = [start.isoformat() for start in starts]
+    start_ts = int(start_of_today.timestamp())
+    return [(start_ts + i * HALF_HOUR_SECONDS, isos[i], isos[i + 1]) for i in range(2 * 48)]
+
+
+def _is_time_in_period(check_time: time, start: time, end: time) -> bool:
+    """Check if a time falls within a period, handling midnight crossover."""
+    if start < end:
+        # Simple case: period doesn't cross midnight
+        return start <= check_time < end
+    else:
+        # Period crosses midnight (e.g., 22:00 to 00:00)
+        return check_time >= start or check_time < end
+
+
+def _half_hour_slots(periods: List[Tuple[time, time]]) -> Tuple[bool, ...]:
+    """Flag each of the 48 half-hour slots of the day that falls within any of the periods."""
+    return tuple(
+        any(_is_time_in_period(time(slot // 2, 30 * (slot % 2)), start, end) for start, end in periods)
+        for slot in range(48)
+    )
+
 
 class OctopusEnergyAPI:
     """API client for Octopus Energy."""
@@ -29,44 +237,75 @@ class OctopusEnergyAPI:
     ]
     COSY_PEAK_START = time(16, 0)
     COSY_PEAK_END = time(19, 0)
+    
+    # Schedules precomputed per half-hour slot of the day (slot = hour * 2 + minute // 30)
+    # Go: True for night rate slots
+    GO_NIGHT_SLOTS = _half_hour_slots([(GO_NIGHT_START, GO_NIGHT_END)])
+    # Cosy: index into (day, cosy, peak) rates
+    COSY_SLOT_CLASSES = tuple(
+        2 if is_peak else 1 if is_cosy else 0
+        for is_peak, is_cosy in zip(
+            _half_hour_slots([(COSY_PEAK_START, COSY_PEAK_END)]), _half_hour_slots(COSY_PERIODS))
+    )
 
     def __init__(self, config: dict[str, str]) -> None:
         """Initialize the API client."""
         self.config = config
         self._kraken_token = None
+        self._kraken_token_expiry = 0.0
+        self._device_id = None
+        self._rest_cache: Dict[str, Tuple[float, Any]] = {}
+        self._etag_cache: Dict[str, Tuple[str | None, str | None, Any]] = {}
+        
+        # REST API uses Basic auth with the API key; build the header once
+        credentials = base64.b64encode(f"{config['api_key']}:".encode()).decode()
+        self._rest_headers = {"Authorization": f"Basic {credentials}"}
 
-    def _is_time_in_period(self, check_time: time, start: time, end: time) -> bool:
-        """Check if a time falls within a period, handling midnight crossover."""
-        if start < end:
-            # Simple case: period doesn't cross midnight
-            return start <= check_time < end
-        else:
-            # Period crosses midnight (e.g., 22:00 to 00:00)
-            return check_time >= start or check_time < end
-    
-    def _get_go_rate_for_time(self, dt: datetime, day_rate: float, night_rate: float) -> float:
+        # Reuse one session so keep-alive connections are pooled across calls
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            # Room for every concurrent tariff fetch plus the GraphQL calls
+            pool_maxsize=len(TARIFFS_TO_COMPARE) + 2,
+            # Only idempotent requests (the REST GETs) are retried. Rate limiting (429) isn't, as its
+            # Retry-After could block a worker for that long; the next poll retries instead
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        # Worker threads for the concurrent fetches, kept across refreshes
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(TARIFFS_TO_COMPARE) + 1, thread_name_prefix="octopus_energy_api")
+
+    def close(self) -> None:
+        """Shut down the fetch workers and close the underlying HTTP session."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    def _get_go_rate_for_time(self, slot: int, day_rate: float, night_rate: float) -> float:
         """
-        Get the applicable Go tariff rate for a specific datetime.
+        Get the applicable Go tariff rate for a specific half-hour slot.
         
         Args:
-            dt: Datetime in UK timezone
+            slot: Half-hour slot of the day in UK time (hour * 2 + minute // 30)
             day_rate: Day rate in pence/kWh
             night_rate: Night rate in pence/kWh
             
         Returns:
             Applicable rate in pence/kWh
         """
-        t = dt.time()
-        if self._is_time_in_period(t, self.GO_NIGHT_START, self.GO_NIGHT_END):
+        if self.GO_NIGHT_SLOTS[slot]:
             return night_rate
         return day_rate
     
-    def _get_cosy_rate_for_time(self, dt: datetime, day_rate: float, cosy_rate: float, peak_rate: float) -> float:
+    def _get_cosy_rate_for_time(self, slot: int, day_rate: float, cosy_rate: float, peak_rate: float) -> float:
         """
-        Get the applicable Cosy tariff rate for a specific datetime.
+        Get the applicable Cosy tariff rate for a specific half-hour slot.
         
         Args:
-            dt: Datetime in UK timezone
+            slot: Half-hour slot of the day in UK time (hour * 2 + minute // 30)
             day_rate: Standard day rate in pence/kWh
             cosy_rate: Cosy period rate in pence/kWh
             peak_rate: Peak period rate in pence/kWh
@@ -74,19 +313,8 @@ class OctopusEnergyAPI:
         Returns:
             Applicable rate in pence/kWh
         """
-        t = dt.time()
-        
-        # Check if in peak period
-        if self._is_time_in_period(t, self.COSY_PEAK_START, self.COSY_PEAK_END):
-            return peak_rate
-        
-        # Check if in any cosy period
-        for start, end in self.COSY_PERIODS:
-            if self._is_time_in_period(t, start, end):
-                return cosy_rate
-        
-        # Otherwise, use day rate
-        return day_rate
+        # Peak takes precedence over cosy periods; otherwise, use day rate
+        return (day_rate, cosy_rate, peak_rate)[self.COSY_SLOT_CLASSES[slot]]
 
     def test_connection(self) -> bool:
         """Test the connection to the API."""
@@ -98,9 +326,14 @@ class OctopusEnergyAPI:
             _LOGGER.error("Failed to connect to Octopus Energy API: %s", e)
             raise
 
-    def _obtain_kraken_token(self) -> str:
-        """Obtain a Kraken token for GraphQL authentication."""
-        headers = {"Content-Type": "application/json"}
+    def _obtain_kraken_token(self, force_refresh: bool = False) -> str:
+        """Obtain a Kraken token for GraphQL authentication, reusing the cached one until it nears expiry."""
+        if (
+            not force_refresh
+            and self._kraken_token
+            and self._kraken_token_expiry - datetime.now(timezone.utc).timestamp() > KRAKEN_TOKEN_EXPIRY_MARGIN
+        ):
+            return self._kraken_token
         
         mutation_variables = {
             "input": {
@@ -108,48 +341,49 @@ class OctopusEnergyAPI:
             }
         }
         
-        mutation = """
-        mutation obtainKrakenToken($input: ObtainJSONWebTokenInput!) {
-            obtainKrakenToken(input: $input) {
-                token
-            }
-        }
-        """
-        
         payload = {
-            "query": mutation,
+            "query": KRAKEN_TOKEN_MUTATION,
             "variables": mutation_variables
         }
         
         try:
-            response = requests.post(GRAPHQL_URL, json=payload, headers=headers, timeout=30)
+            response = self._session.post(GRAPHQL_URL, data=json_dumps(payload), timeout=30)
             response.raise_for_status()
-            result = response.json()
+            result = json_loads(response.content)
             
             if "errors" in result:
                 raise Exception(f"Error obtaining Kraken token: {result['errors']}")
             
             token = result["data"]["obtainKrakenToken"]["token"]
             self._kraken_token = token
+            self._kraken_token_expiry = _jwt_expiry(token)
             return token
             
         except requests.exceptions.RequestException as e:
             _LOGGER.error("Error obtaining Kraken token: %s", e)
             raise
 
-    def _execute_graphql_query(self, query: str, kraken_token: str) -> Dict:
-        """Execute a GraphQL query against Octopus Energy API with Kraken token."""
-        headers = {
-            "Authorization": kraken_token,
-            "Content-Type": "application/json"
-        }
+    def _execute_graphql_query(self, query: str, kraken_token: str, variables: Dict[str, Any] = None) -> Dict:
+        """Execute a GraphQL query against Octopus Energy API with Kraken token.
         
+        If the token is rejected, a new one is obtained and the query retried once.
+        """
         payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        body = json_dumps(payload)
         
         try:
-            response = requests.post(GRAPHQL_URL, json=payload, headers=headers, timeout=30)
-            response.raise_for_status()
-            result = response.json()
+            for attempt in range(2):
+                response = self._session.post(GRAPHQL_URL, data=body, headers={"Authorization": kraken_token}, timeout=30)
+                response.raise_for_status()
+                result = json_loads(response.content)
+                
+                if attempt or "errors" not in result or not _is_auth_error(result["errors"]):
+                    break
+                
+                _LOGGER.debug("Kraken token was rejected, obtaining a new one")
+                kraken_token = self._obtain_kraken_token(force_refresh=True)
             
             if "errors" in result:
                 raise Exception(f"GraphQL errors: {result['errors']}")
@@ -159,59 +393,104 @@ class OctopusEnergyAPI:
             _LOGGER.error("Error making GraphQL request: %s", e)
             raise
 
-    def _rest_query(self, url: str, headers: Dict[str, str] = None) -> Dict:
-        """Make a REST API call and return JSON response."""
+    def _rest_query(self, url: str, headers: Dict[str, str] = None, ttl: float | Callable[[Dict], float] = 0) -> Dict:
+        """Make a REST API call and return JSON response.
+        
+        Responses are cached in memory for ``ttl`` seconds when a ttl is given,
+        which may be a function of the fetched response.
+        Otherwise, responses that carried an ETag or Last-Modified header are
+        revalidated with a conditional request and reused on a 304.
+        """
+        if ttl:
+            cached = self._rest_cache.get(url)
+            if cached is not None and cached[0] > monotonic():
+                return cached[1]
+        
         if headers is None:
-            credentials = base64.b64encode(f"{self.config['api_key']}:".encode()).decode()
-            headers = {"Authorization": f"Basic {credentials}"}
+            headers = self._rest_headers
+        
+        validated = self._etag_cache.get(url)
+        if validated is not None:
+            etag, last_modified, _ = validated
+            headers = dict(headers)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session.get(url, headers=headers, timeout=30)
             response.raise_for_status()
-            return response.json()
+            
+            if response.status_code == 304 and validated is not None:
+                result = validated[2]
+            else:
+                result = json_loads(response.content)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    # Bound the cache by evicting the oldest entry
+                    if url not in self._etag_cache and len(self._etag_cache) >= ETAG_CACHE_SIZE:
+                        self._etag_cache.pop(next(iter(self._etag_cache)), None)
+                    self._etag_cache[url] = (etag, last_modified, result)
         except requests.exceptions.RequestException as e:
             _LOGGER.error("Error making REST API request to %s: %s", url, e)
             raise
+        except ValueError as e:
+            # Don't keep serving anything cached for a URL that returned bad JSON
+            self._rest_cache.pop(url, None)
+            self._etag_cache.pop(url, None)
+            _LOGGER.error("Invalid JSON in REST API response from %s: %s", url, e)
+            raise
+        
+        if callable(ttl):
+            ttl = ttl(result)
+        if ttl:
+            now = monotonic()
+            # Drop expired entries so dated URLs don't accumulate
+            for cached_url, (expiry, _) in list(self._rest_cache.items()):
+                if expiry <= now:
+                    self._rest_cache.pop(cached_url, None)
+            self._rest_cache[url] = (now + ttl, result)
+        
+        return result
+
+    def _consumption_variables(self, device_id: str, today_uk: date) -> Dict[str, str]:
+        """Build the smartMeterTelemetry variables for the given day (UK time)."""
+        # Create start and end times for the day in UK time
+        start_of_day_uk = datetime.combine(today_uk, time.min, tzinfo=UK_TZ)
+        end_of_day_uk = datetime.combine(today_uk, time(23, 59, 59), tzinfo=UK_TZ)
+        
+        # Convert to UTC for API request
+        return {
+            "deviceId": device_id,
+            "start": _format_utc(start_of_day_uk),
+            "end": _format_utc(end_of_day_uk),
+        }
 
     def _get_account_info(self, kraken_token: str) -> Dict:
         """Get account information including current tariff."""
-        query = f"""query{{
-            account(
-                accountNumber: "{self.config['account_number']}"
-            ) {{
-                electricityAgreements(active: true) {{
-                    validFrom
-                    validTo
-                    meterPoint {{
-                        meters(includeInactive: false) {{
-                            smartDevices {{
-                                deviceId
-                            }}
-                        }}
-                        mpan
-                        direction
-                    }}
-                    tariff {{
-                        ... on HalfHourlyTariff {{
-                            id
-                            productCode
-                            tariffCode
-                            standingCharge
-                        }}
-                    }}
-                }}
-            }}
-        }}"""
-        
-        result = self._execute_graphql_query(query, kraken_token)
-        
-        import_agreement = None
-        for agreement in result.get("account", {}).get("electricityAgreements", []):
-            meter_point = agreement.get("meterPoint", {})
-            if (meter_point.get("direction") == "IMPORT" and 
-                meter_point.get("mpan") == self.config["mpan"]):
-                import_agreement = agreement
-                break
+        variables = {"accountNumber": self.config["account_number"]}
+        result = self._execute_graphql_query(ACCOUNT_QUERY, kraken_token, variables)
+        return self._parse_account_info(result)
+
+    def _get_account_info_and_consumption(self, device_id: str, kraken_token: str, today_uk: date) -> Tuple[Dict, List[Dict]]:
+        """Get account information and consumption data for a known device in one request."""
+        variables = {
+            "accountNumber": self.config["account_number"],
+            **self._consumption_variables(device_id, today_uk),
+        }
+        result = self._execute_graphql_query(ACCOUNT_AND_CONSUMPTION_QUERY, kraken_token, variables)
+        return self._parse_account_info(result), result.get("smartMeterTelemetry", [])
+
+    def _parse_account_info(self, result: Dict) -> Dict:
+        """Extract the IMPORT agreement details from an account query result."""
+        mpan = self.config["mpan"]
+        import_agreement = next((
+            agreement for agreement in result.get("account", {}).get("electricityAgreements", [])
+            if agreement.get("meterPoint", {}).get("direction") == "IMPORT"
+            and agreement.get("meterPoint", {}).get("mpan") == mpan
+        ), None)
         
         if not import_agreement:
             raise Exception("No matching IMPORT meter point found in account data")
@@ -221,15 +500,13 @@ class OctopusEnergyAPI:
             raise Exception("No tariff information found for the IMPORT meter")
         
         # Find device ID
-        device_id = None
         meter_point = import_agreement.get("meterPoint", {})
-        for meter in meter_point.get("meters", []):
-            for device in meter.get("smartDevices", []):
-                if "deviceId" in device:
-                    device_id = device["deviceId"]
-                    break
-            if device_id:
-                break
+        device_id = next((
+            device["deviceId"]
+            for meter in meter_point.get("meters", [])
+            for device in meter.get("smartDevices", [])
+            if "deviceId" in device
+        ), None)
         
         if not device_id:
             raise Exception("No device ID found for the IMPORT meter")
@@ -241,78 +518,49 @@ class OctopusEnergyAPI:
             "device_id": device_id
         }
 
-    def _get_consumption_data(self, device_id: str, kraken_token: str) -> Tuple[List[Dict], date]:
-        """Get consumption data for today (UK time)."""
-        from datetime import datetime, timezone
-        from zoneinfo import ZoneInfo
+    def _get_analysis_date(self, now: datetime) -> date:
+        """Get today's date in UK time."""
+        return now.astimezone(UK_TZ).date()
+
+    def _get_consumption_data(self, device_id: str, kraken_token: str, today_uk: date) -> List[Dict]:
+        """Get consumption data for the given day (UK time)."""
+        variables = self._consumption_variables(device_id, today_uk)
+        result = self._execute_graphql_query(CONSUMPTION_QUERY, kraken_token, variables)
+        return result.get("smartMeterTelemetry", [])
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _identify_current_tariff(tariff_code: str) -> str:
+        """Identify the current tariff from tariff code."""
+        match = TARIFF_KEYWORDS_RE.search(tariff_code)
+        if match:
+            return TARIFF_KEYWORDS[match.group(0).upper()]
         
-        # Get current time in UK timezone
-        uk_tz = ZoneInfo("Europe/London")
-        now_uk = datetime.now(uk_tz)
-        today_uk = now_uk.date()
+        return f"Other tariff: {tariff_code}"
+
+    def _get_import_products(self) -> Dict[str, Dict]:
+        """Get the IMPORT products catalogue keyed by lower-cased display name."""
+        all_products = self._rest_query(
+            f"{REST_BASE_URL}/products/?brand=OCTOPUS_ENERGY&is_business=false", ttl=PRODUCTS_CACHE_TTL)
         
-        # Create start and end times for today in UK time
-        start_of_day_uk = datetime(today_uk.year, today_uk.month, today_uk.day, 0, 0, 0, tzinfo=uk_tz)
-        end_of_day_uk = datetime(today_uk.year, today_uk.month, today_uk.day, 23, 59, 59, tzinfo=uk_tz)
+        products = {}
+        for p in all_products["results"]:
+            if p["direction"] == "IMPORT":
+                products.setdefault(p["display_name"].lower(), p)
         
-        # Convert to UTC for API request
-        start_utc = start_of_day_uk.astimezone(timezone.utc)
-        end_utc = end_of_day_uk.astimezone(timezone.utc)
-        
-        query = f"""query {{
-            smartMeterTelemetry(
-                deviceId: "{device_id}"
-                grouping: HALF_HOURLY
-                start: "{start_utc.strftime('%Y-%m-%dT%H:%M:%SZ')}"
-                end: "{end_utc.strftime('%Y-%m-%dT%H:%M:%SZ')}"
-            ) {{
-                readAt
-                consumptionDelta
-                costDeltaWithTax
-            }}
-        }}"""
-        
-        result = self._execute_graphql_query(query, kraken_token)
-        consumption = result.get("smartMeterTelemetry", [])
-        
-        return consumption, today_uk
-
-    def _identify_current_tariff(self, tariff_code: str) -> str:
-        """Identify the current tariff from tariff code."""
-        tariff_code_upper = tariff_code.upper()
-        
-        if "AGILE" in tariff_code_upper:
-            return "Agile Octopus"
-        elif "GO" in tariff_code_upper:
-            return "Octopus Go"
-        elif "COSY" in tariff_code_upper:
-            return "Cosy Octopus"
-        elif "FLEX" in tariff_code_upper:
-            return "Flexible Octopus"
-        else:
-            return f"Other tariff: {tariff_code}"
-
-    def _get_potential_tariff_rates(self, tariff: str, region_code: str, analysis_date: date) -> Tuple[float, List[Dict], str]:
+        return products
+
+    def _get_potential_tariff_rates(self, tariff: str, products: Dict[str, Dict], region_code: str, period_from: str, period_to: str) -> Tuple[float, List[UnitRate], str]:
         """Get tariff rates for a specific tariff and region using REST API (UK timezone)."""
-        from datetime import datetime, timedelta, timezone
-        from zoneinfo import ZoneInfo
-        
         try:
-            all_products = self._rest_query(f"{REST_BASE_URL}/products/?brand=OCTOPUS_ENERGY&is_business=false")
+            tariff_lower = tariff.lower()
             
-            product = None
             # Try exact match first
-            for p in all_products["results"]:
-                if (p["display_name"] == tariff and p["direction"] == "IMPORT"):
-                    product = p
-                    break
+            product = products.get(tariff_lower)
             
             # Try partial match if exact match fails
             if product is None:
-                for p in all_products["results"]:
-                    if (tariff.lower() in p["display_name"].lower() and p["direction"] == "IMPORT"):
-                        product = p
-                        break
+                product = next((p for name, p in products.items() if tariff_lower in name), None)
             
             if product is None:
                 raise ValueError(f"No matching tariff found for '{tariff}'")
@@ -325,7 +573,7 @@ class OctopusEnergyAPI:
             if not product_link:
                 raise ValueError(f"Self link not found for tariff {product['code']}")
             
-            tariff_details = self._rest_query(product_link)
+            tariff_details = self._rest_query(product_link, ttl=PRODUCT_DETAILS_CACHE_TTL)
             
             # Get the standing charge including VAT
             region_code_key = f"_{region_code}"
@@ -354,54 +602,38 @@ class OctopusEnergyAPI:
             if not unit_rates_link:
                 raise ValueError(f"Standard unit rates link not found for region: {region_code_key}")
             
-            # Convert analysis_date to UK timezone for proper date boundaries
-            uk_tz = ZoneInfo("Europe/London")
-            start_of_day_uk = datetime(analysis_date.year, analysis_date.month, analysis_date.day, 0, 0, 0, tzinfo=uk_tz)
-            
-            # Get rates from start of today to end of tomorrow (UK time)
-            # We need tomorrow's rates for the event entities
-            end_of_tomorrow_uk = start_of_day_uk + timedelta(days=2)
-            
-            # Convert to UTC for API request
-            start_utc = start_of_day_uk.astimezone(timezone.utc)
-            end_utc = end_of_tomorrow_uk.astimezone(timezone.utc)
-            
-            _LOGGER.debug(f"Fetching rates from {start_utc} to {end_utc} (UK: {start_of_day_uk} to {end_of_tomorrow_uk})")
-            
             # Get rates for today and tomorrow (UK time)
-            unit_rates_link_with_time = f"{unit_rates_link}?period_from={start_utc.strftime('%Y-%m-%dT%H:%M:%SZ')}&period_to={end_utc.strftime('%Y-%m-%dT%H:%M:%SZ')}"
-            unit_rates = self._rest_query(unit_rates_link_with_time)
+            unit_rates_link_with_time = f"{unit_rates_link}?period_from={period_from}&period_to={period_to}"
+            response = self._rest_query(unit_rates_link_with_time, ttl=partial(_unit_rates_ttl, _iso_to_epoch(period_to)))
+            unit_rates = _parse_unit_rates(response.get("results", []))
             
-            return standing_charge_inc_vat, unit_rates.get("results", []), product["code"]
+            return float(standing_charge_inc_vat), unit_rates, product["code"]
             
         except Exception as e:
             _LOGGER.error("Error fetching tariff rates for %s: %s", tariff, e)
             raise
 
-    def _calculate_cost_for_consumption(self, consumption_data: list, unit_rates: list, standing_charge: float, analysis_date: date, tariff_name: str = None) -> float:
-        """Calculate the total cost for given consumption and rates (UK timezone aware)."""
-        from datetime import datetime, timedelta, timezone
-        from zoneinfo import ZoneInfo
-        
-        total_energy_cost = 0.0
-        uk_tz = ZoneInfo("Europe/London")
+    def _calculate_cost_for_consumption(self, readings: List[Tuple[float, int, int]], unit_rates: List[UnitRate], standing_charge: float, start_of_day_ts: int, end_of_day_ts: int, tariff_kind: str | None = None) -> float:
+        """Calculate the total cost for given consumption and rates (UK timezone aware).
         
+        Readings are non-zero (kWh, readAt epoch seconds, readAt UK half-hour slot) tuples, and
+        the day boundaries are the epoch seconds of the analysis day's UK midnights, and
+        tariff_kind is the tariff's TARIFF_KEYWORDS key.
+        """
         # Determine if this is a time-of-day tariff
-        is_go_tariff = tariff_name and "go" in tariff_name.lower() and "agile" not in tariff_name.lower()
-        is_cosy_tariff = tariff_name and "cosy" in tariff_name.lower()
+        is_go_tariff = tariff_kind == "GO"
+        is_cosy_tariff = tariff_kind == "COSY"
         is_time_of_day_tariff = is_go_tariff or is_cosy_tariff
         
         if is_time_of_day_tariff:
             # For Go and Cosy tariffs: Extract the different rate tiers from API response
             # These tariffs return 2-4 rates total, not half-hourly rates
             
-            # Filter for DIRECT_DEBIT rates
-            dd_rates = [r for r in unit_rates if r.get("payment_method") == "DIRECT_DEBIT"]
-            if not dd_rates:
-                dd_rates = unit_rates
-            
-            # Extract unique rate values
-            rate_values = sorted(set(float(r["value_inc_vat"]) for r in dd_rates))
+            # Extract unique rate values, cheapest first, from DIRECT_DEBIT rates if there are any
+            rate_values = sorted(
+                {value_inc_vat for _, _, is_direct_debit, value_inc_vat in unit_rates if is_direct_debit}
+                or {value_inc_vat for _, _, _, value_inc_vat in unit_rates}
+            )
             
             if is_go_tariff:
                 # Go has 2 rates: night (cheap) and day (expensive)
@@ -410,8 +642,8 @@ class OctopusEnergyAPI:
                     # Fallback to generic calculation
                     is_time_of_day_tariff = False
                 else:
-                    night_rate = min(rate_values)  # Cheapest is night rate
-                    day_rate = max(rate_values)    # Most expensive is day rate
+                    night_rate = rate_values[0]  # Cheapest is night rate
+                    day_rate = rate_values[-1]   # Most expensive is day rate
                     
                     _LOGGER.info(f"Go tariff rates: night={night_rate}p/kWh, day={day_rate}p/kWh (period: {self.GO_NIGHT_START.strftime('%H:%M')}-{self.GO_NIGHT_END.strftime('%H:%M')})")
             
@@ -421,96 +653,83 @@ class OctopusEnergyAPI:
                     _LOGGER.error(f"Expected 3 rates for Cosy tariff, got {len(rate_values)}: {rate_values}")
                     is_time_of_day_tariff = False
                 else:
-                    rate_values_sorted = sorted(rate_values)
-                    cosy_rate = rate_values_sorted[0]  # Cheapest
-                    day_rate = rate_values_sorted[1]   # Middle
-                    peak_rate = rate_values_sorted[2]  # Most expensive
+                    cosy_rate = rate_values[0]  # Cheapest
+                    day_rate = rate_values[1]   # Middle
+                    peak_rate = rate_values[2]  # Most expensive
                     
                     _LOGGER.info(f"Cosy tariff rates: cosy={cosy_rate}p/kWh, day={day_rate}p/kWh, peak={peak_rate}p/kWh")
         
         # For Agile/Flexible: prepare rate data once before processing readings
         if not is_time_of_day_tariff:
-            # Get UK timezone boundaries for the analysis date
-            start_of_day_uk = datetime(analysis_date.year, analysis_date.month, analysis_date.day, 0, 0, 0, tzinfo=uk_tz)
-            end_of_day_uk = start_of_day_uk + timedelta(days=1)
-            
-            # Convert to UTC for comparison
-            start_of_day_utc = start_of_day_uk.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
-            end_of_day_utc = end_of_day_uk.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
-            
-            # Filter rates to only those that apply to TODAY in UK time
-            applicable_rates = []
-            for rate in unit_rates:
-                valid_from = rate.get("valid_from")
-                valid_to = rate.get("valid_to")
-                
-                # Only include DIRECT_DEBIT rates
-                if rate.get("payment_method") != "DIRECT_DEBIT":
+            # Map each rate's start time (epoch seconds) to its price in a single pass, collecting the
+            # DIRECT_DEBIT rates that apply to TODAY in UK time alongside a fallback of any rates
+            rate_map = {}
+            fallback_rate_map = {}
+            for valid_from, valid_to, is_direct_debit, value_inc_vat in unit_rates:
+                # Rate must have started before end of today
+                if valid_from >= end_of_day_ts:
                     continue
                 
-                # Rate must have started before end of today
-                if valid_from and valid_from < end_of_day_utc:
-                    # Rate must still be valid (no valid_to, or valid_to is after start of today)
-                    if valid_to is None or valid_to > start_of_day_utc:
-                        applicable_rates.append(rate)
+                # For rates with the same valid_from, prefer DIRECT_DEBIT
+                if is_direct_debit or valid_from not in fallback_rate_map:
+                    fallback_rate_map[valid_from] = value_inc_vat
+                
+                # Rate must still be valid (no valid_to, or valid_to is after start of today)
+                if is_direct_debit and (valid_to is None or valid_to > start_of_day_ts):
+                    rate_map[valid_from] = value_inc_vat
             
             # If no DIRECT_DEBIT rates, fall back to any rates
-            if not applicable_rates:
-                applicable_rates = [r for r in unit_rates if r.get("valid_from", "") < end_of_day_utc]
-            
-            # Create a mapping of time periods to rates
-            rate_map = {}
-            for rate in applicable_rates:
-                valid_from = rate["valid_from"]
-                if valid_from not in rate_map or rate.get("payment_method") == "DIRECT_DEBIT":
-                    rate_map[valid_from] = float(rate["value_inc_vat"])
-            
-            # Sort rates by time (earliest first)
-            sorted_rates = sorted(rate_map.items())
-        
-        # Process each consumption reading
-        for reading in consumption_data:
-            try:
-                consumption_kwh = float(reading["consumptionDelta"]) / 1000
-            except (TypeError, ValueError):
-                consumption_kwh = 0.0
-            
-            if consumption_kwh == 0:
-                continue
-            
-            read_time_str = reading["readAt"]
-            read_time_utc = datetime.fromisoformat(read_time_str.replace('Z', '+00:00'))
-            read_time_uk = read_time_utc.astimezone(uk_tz)
-            
-            # Get the applicable rate
+            if not rate_map:
+                rate_map = fallback_rate_map
+            
+            # Sort rates by time (earliest first) into parallel arrays for binary search
+            rate_times = sorted(rate_map)
+            rate_prices = [rate_map[t] for t in rate_times]
+            
+            # Walk the sorted rates once to find the rate for each half-hour slot of the day,
+            # so readings on slot boundaries become a direct index lookup
+            slot_rates = []
+            if rate_times:
+                j = 0
+                slot_end = start_of_day_ts + HALF_HOUR_SECONDS
+                while slot_end <= end_of_day_ts:
+                    while j < len(rate_times) and rate_times[j] < slot_end:
+                        j += 1
+                    slot_rates.append(rate_prices[j - 1] if j else rate_prices[0])
+                    slot_end += HALF_HOUR_SECONDS
+        
+        # Get the applicable rate for each consumption reading
+        consumptions = []
+        matching_rates = []
+        for consumption_kwh, read_ts, read_slot_uk in readings:
             if is_time_of_day_tariff:
                 # Use time-of-day logic
                 if is_go_tariff:
-                    matching_rate = self._get_go_rate_for_time(read_time_uk, day_rate, night_rate)
-                elif is_cosy_tariff:
-                    matching_rate = self._get_cosy_rate_for_time(read_time_uk, day_rate, cosy_rate, peak_rate)
+                    matching_rate = self._get_go_rate_for_time(read_slot_uk, day_rate, night_rate)
                 else:
-                    matching_rate = None
-            else:
+                    matching_rate = self._get_cosy_rate_for_time(read_slot_uk, day_rate, cosy_rate, peak_rate)
+            elif rate_times:
                 # For Agile and Flexible: use timestamp-based matching
                 # Find the rate that applies to this reading
                 # Use < not <= because readAt is end of consumption period
-                matching_rate = None
-                for rate_time, rate_value in reversed(sorted_rates):
-                    if rate_time < read_time_str:
-                        matching_rate = rate_value
-                        break
-                
-                # Fallback to first rate if no match
-                if matching_rate is None and sorted_rates:
-                    matching_rate = sorted_rates[0][1]
+                slot, remainder = divmod(read_ts - start_of_day_ts, HALF_HOUR_SECONDS)
+                if remainder == 0 and 0 < slot <= len(slot_rates):
+                    matching_rate = slot_rates[slot - 1]
+                else:
+                    i = bisect_left(rate_times, read_ts) - 1
+                    # Fallback to first rate if no match
+                    matching_rate = rate_prices[i] if i >= 0 else rate_prices[0]
+            else:
+                continue
             
-            if matching_rate is not None:
-                cost = consumption_kwh * float(matching_rate)
-                total_energy_cost += cost
+            consumptions.append(consumption_kwh)
+            matching_rates.append(matching_rate)
+        
+        # Multiply and sum in a single C-level pass
+        total_energy_cost = sum(map(mul, consumptions, matching_rates))
         
         # Add daily standing charge (in pence) to get total cost in pence
-        total_cost = total_energy_cost + float(standing_charge)
+        total_cost = total_energy_cost + standing_charge
         
         return total_cost
 
@@ -520,11 +739,67 @@ class OctopusEnergyAPI:
             # Get Kraken token
             kraken_token = self._obtain_kraken_token()
             
-            # Get account information
-            account_info = self._get_account_info(kraken_token)
+            # Read the clock once; every date and current-rate decision in this refresh uses it
+            now_utc = datetime.now(timezone.utc)
+            now_ts = int(now_utc.timestamp())
+            analysis_date = self._get_analysis_date(now_utc)
+            consumption_data = None
+            
+            # Day boundaries shared by every tariff's rate fetch, cost calculation and event periods
+            start_of_day_uk = datetime.combine(analysis_date, time.min, tzinfo=UK_TZ)
+            end_of_day_uk = start_of_day_uk + timedelta(days=1)
+            start_of_day_ts = int(start_of_day_uk.timestamp())
+            end_of_day_ts = int(end_of_day_uk.timestamp())
+            # Event periods' ISO strings are shared across tariffs
+            event_periods = _event_periods(now_utc.replace(hour=0, minute=0, second=0, microsecond=0))
+            
+            # Get rates from start of today to end of tomorrow (UK time), as we need
+            # tomorrow's rates for the event entities
+            end_of_tomorrow_uk = start_of_day_uk + timedelta(days=2)
+            rates_period_from = _format_utc(start_of_day_uk)
+            rates_period_to = _format_utc(end_of_tomorrow_uk)
+            
+            _LOGGER.debug(f"Fetching rates from {rates_period_from} to {rates_period_to} (UK: {start_of_day_uk} to {end_of_tomorrow_uk})")
+            
+            # Get account information, batched with the consumption query once the device ID is known
+            if self._device_id:
+                try:
+                    account_info, consumption_data = self._get_account_info_and_consumption(
+                        self._device_id, kraken_token, analysis_date)
+                except Exception:
+                    self._device_id = None
+                    raise
+                
+                if account_info["device_id"] != self._device_id:
+                    consumption_data = None
+            else:
+                account_info = self._get_account_info(kraken_token)
+            
+            self._device_id = account_info["device_id"]
+            
+            # Fetch consumption (if still needed) and every tariff's rates concurrently over the pooled session
+            consumption_future = None
+            if consumption_data is None:
+                consumption_future = self._executor.submit(
+                    self._get_consumption_data, account_info["device_id"], kraken_token, analysis_date)
             
-            # Get consumption data
-            consumption_data, analysis_date = self._get_consumption_data(account_info["device_id"], kraken_token)
+            # Fetch the products catalogue once and share it across tariffs. Without it no tariff
+            # can be compared, but consumption is still reported
+            rate_futures = {}
+            try:
+                products = self._get_import_products()
+            except Exception as e:
+                _LOGGER.error("Error fetching products, skipping tariff comparison: %s", e)
+            else:
+                rate_futures = {
+                    tariff: self._executor.submit(
+                        self._get_potential_tariff_rates, tariff, products, account_info["region_code"],
+                        rates_period_from, rates_period_to)
+                    for tariff in TARIFFS_TO_COMPARE
+                }
+            
+            if consumption_future is not None:
+                consumption_data = consumption_future.result()
             
             if not consumption_data:
                 _LOGGER.warning("No consumption data found")
@@ -533,8 +808,39 @@ class OctopusEnergyAPI:
             # Identify current tariff
             current_tariff_name = self._identify_current_tariff(account_info["tariff_code"])
             
-            # Calculate total consumption
-            total_consumption = sum(float(reading.get("consumptionDelta", 0) or 0) / 1000 for reading in consumption_data)
+            # On a normal 48-slot day the UK offset is fixed, so a reading's UK slot follows from the
+            # day's UTC offset. Only clock-change days (46 or 50 slots) need a table of each half
+            # hour's slot, as UK offsets only change on half-hour boundaries
+            day_slot_count = (end_of_day_ts - start_of_day_ts) // HALF_HOUR_SECONDS
+            uk_offset = int(UK_TZ.utcoffset(start_of_day_uk).total_seconds())
+            uk_day_slots = None
+            if day_slot_count != 48:
+                uk_day_slots = [
+                    _uk_half_hour_slot(start_of_day_ts + i * HALF_HOUR_SECONDS) for i in range(day_slot_count + 1)
+                ]
+            
+            # Parse readings once and share them across tariffs, totalling consumption in the same pass
+            total_consumption = 0.0
+            readings = []
+            for reading in consumption_data:
+                try:
+                    consumption_kwh = float(reading.get("consumptionDelta")) / 1000
+                except (TypeError, ValueError):
+                    continue
+                
+                total_consumption += consumption_kwh
+                if consumption_kwh == 0:
+                    continue
+                
+                read_ts = _iso_to_epoch(reading["readAt"])
+                day_slot = (read_ts - start_of_day_ts) // HALF_HOUR_SECONDS
+                if not 0 <= day_slot <= day_slot_count:
+                    read_slot_uk = _uk_half_hour_slot(read_ts)
+                elif uk_day_slots is None:
+                    read_slot_uk = (read_ts + uk_offset) // HALF_HOUR_SECONDS % 48
+                else:
+                    read_slot_uk = uk_day_slots[day_slot]
+                readings.append((consumption_kwh, read_ts, read_slot_uk))
             
             _LOGGER.info(f"Processing data for {analysis_date} (UK time)")
             _LOGGER.info(f"Total consumption: {total_consumption}kWh from {len(consumption_data)} readings")
@@ -543,10 +849,9 @@ class OctopusEnergyAPI:
             tariff_costs = {}
             tariff_rates = {}
             
-            for tariff in TARIFFS_TO_COMPARE:
+            for tariff, rate_future in rate_futures.items():
                 try:
-                    standing_charge, unit_rates, product_code = self._get_potential_tariff_rates(
-                        tariff, account_info["region_code"], analysis_date)
+                    standing_charge, unit_rates, product_code = rate_future.result()
                     
                     _LOGGER.info(f"{tariff}: Fetched {len(unit_rates)} rate periods, standing charge: {standing_charge}p")
                     
@@ -555,19 +860,21 @@ class OctopusEnergyAPI:
                         continue
                     
                     total_cost = self._calculate_cost_for_consumption(
-                        consumption_data, unit_rates, standing_charge, analysis_date, tariff)
+                        readings, unit_rates, standing_charge, start_of_day_ts, end_of_day_ts, TARIFF_KINDS[tariff])
                     
-                    tariff_key = tariff.lower().replace(" ", "_")
+                    tariff_key = TARIFF_KEYS[tariff]
                     tariff_costs[tariff_key] = total_cost
                     
                     _LOGGER.info(f"{tariff}: Total cost = {total_cost}p (energy: {total_cost - standing_charge}p + standing: {standing_charge}p)")
                     
+                    rate_times, rate_values, current_rate = self._build_rate_view(unit_rates, now_ts)
+                    
                     # Store rates for event entities
-                    tariff_rates[tariff_key] = self._format_rates_for_event(unit_rates)
+                    tariff_rates[tariff_key] = self._format_rates_for_event(rate_times, rate_values, event_periods)
                     
                     # Store current rate for Flexible Octopus
                     if tariff == "Flexible Octopus":
-                        current_flexible_rate = self._get_current_rate(unit_rates)
+                        current_flexible_rate = current_rate
                         if current_flexible_rate is not None:
                             tariff_costs["current_flexible_rate"] = current_flexible_rate
                     
@@ -586,133 +893,102 @@ class OctopusEnergyAPI:
             _LOGGER.error("Error getting tariff data: %s", e, exc_info=True)
             raise
 
-    def _format_rates_for_event(self, unit_rates: List[Dict]) -> List[Dict]:
-        """Format unit rates for event entity attributes with all half-hourly periods for today and tomorrow."""
-        from datetime import datetime, timedelta, timezone
+    def _build_rate_view(self, unit_rates: List[UnitRate], now: int) -> Tuple[List[int], List[float], float | None]:
+        """Sort the currently valid unit rates and find the current rate in a single pass.
         
-        if not unit_rates:
-            return []
-        
-        # Filter for DIRECT_DEBIT rates that are currently valid (valid_to is null or in the future)
-        now = datetime.now(timezone.utc).isoformat()
-        filtered_rates = []
-        
-        for rate in unit_rates:
-            # Prefer DIRECT_DEBIT, but fallback to any payment method if not available
-            is_direct_debit = rate.get("payment_method") == "DIRECT_DEBIT"
-            valid_to = rate.get("valid_to")
-            valid_from = rate.get("valid_from")
-            
+        Returns the valid_from times (epoch seconds) and rates (pence/kWh) to use for
+        event periods, plus the current rate (as of now, in epoch seconds) preferring
+        DIRECT_DEBIT with valid_to=null.
+        """
+        direct_debit_rates = []
+        valid_rates = []
+        current_rate = None
+        current_rate_from = None
+        fallback_rate = None
+        fallback_rate_key = None
+        
+        for valid_from, valid_to, is_direct_debit, value_inc_vat in unit_rates:
             # Rate is valid if valid_to is None (ongoing) or in the future
-            is_valid = valid_to is None or valid_to > now
+            if valid_to is not None and valid_to <= now:
+                continue
             
-            # Rate has started
-            has_started = valid_from <= now
+            valid_rates.append((valid_from, is_direct_debit, value_inc_vat))
+            if is_direct_debit:
+                direct_debit_rates.append((valid_from, is_direct_debit, value_inc_vat))
             
-            if is_direct_debit and is_valid:
-                filtered_rates.append(rate)
-        
-        # If no DIRECT_DEBIT rates found, fall back to all valid rates
-        if not filtered_rates:
-            filtered_rates = [r for r in unit_rates if (r.get("valid_to") is None or r.get("valid_to") > now)]
-        
-        # If still no rates, use all rates
-        if not filtered_rates:
-            filtered_rates = unit_rates
+            if valid_from > now:
+                continue
+            
+            # The most recent DIRECT_DEBIT rate with valid_to=null is the current ongoing rate
+            if is_direct_debit and valid_to is None:
+                if current_rate_from is None or valid_from > current_rate_from:
+                    current_rate = value_inc_vat
+                    current_rate_from = valid_from
+            
+            # Fallback: any rate valid now, preferring DIRECT_DEBIT and then the most recent
+            rate_key = (is_direct_debit, valid_from)
+            if fallback_rate_key is None or rate_key > fallback_rate_key:
+                fallback_rate = value_inc_vat
+                fallback_rate_key = rate_key
+        
+        # Prefer DIRECT_DEBIT, then all valid rates, then all rates
+        filtered_rates = direct_debit_rates or valid_rates or [
+            (valid_from, is_direct_debit, value_inc_vat)
+            for valid_from, _, is_direct_debit, value_inc_vat in unit_rates
+        ]
         
-        # Create a map of rates by their valid_from time
+        # Create a map of rates by their valid_from time (epoch seconds)
         rate_map = {}
-        for rate in filtered_rates:
-            valid_from = rate["valid_from"]
+        for valid_from, is_direct_debit, value_inc_vat in filtered_rates:
             # For rates with the same valid_from, prefer DIRECT_DEBIT
-            if valid_from not in rate_map or rate.get("payment_method") == "DIRECT_DEBIT":
-                rate_map[valid_from] = float(rate["value_inc_vat"])
+            if valid_from not in rate_map or is_direct_debit:
+                rate_map[valid_from] = value_inc_vat
         
-        # Sort rates by time to find the correct rate for any period
-        sorted_rates = sorted(rate_map.items())
+        # Sort rates by time into parallel arrays to find the correct rate for any period
+        rate_times = sorted(rate_map)
+        rate_values = [rate_map[t] for t in rate_times]
         
-        # Get today's date at midnight in UTC
-        today = datetime.now(timezone.utc).date()
-        start_of_today = datetime(today.year, today.month, today.day, 0, 0, 0, tzinfo=timezone.utc)
-        end_of_today = start_of_today + timedelta(days=1)
-        end_of_tomorrow = start_of_today + timedelta(days=2)
+        if current_rate is None:
+            current_rate = fallback_rate
+        if current_rate is not None:
+            current_rate = round(current_rate, 2)  # In pence
         
-        formatted_rates = []
+        return rate_times, rate_values, current_rate
+
+    def _format_rates_for_event(self, rate_times: List[int], rate_values: List[float], periods: List[Tuple[int, str, str]]) -> List[Dict]:
+        """Format sorted unit rates for event entity attributes with all half-hourly periods for today and tomorrow.
+        
+        periods are today's and tomorrow's half-hours (UTC) from _event_periods, shared across tariffs.
+        """
+        if not rate_times:
+            return []
         
-        # Determine if we have tomorrow's data by checking if any rates exist after today
-        has_tomorrow = any(rate_time >= end_of_today.isoformat().replace('+00:00', 'Z') for rate_time, _ in sorted_rates)
+        # Determine if we have tomorrow's data; rate_times is sorted, so only the latest rate needs checking
+        periods_today = len(periods) // 2
+        has_tomorrow = rate_times[-1] >= periods[periods_today][0]
         
         # Create periods for today and tomorrow if available
-        end_time = end_of_tomorrow if has_tomorrow else end_of_today
+        if not has_tomorrow:
+            periods = periods[:periods_today]
         
-        current_time = start_of_today
-        while current_time < end_time:
-            period_start = current_time
-            period_end = current_time + timedelta(minutes=30)
-            
-            # Find the applicable rate for this period
-            applicable_rate = None
-            period_start_iso = period_start.isoformat().replace('+00:00', 'Z')
-            
+        formatted_rates = []
+        
+        # Periods and rates are both in time order, so walk the rates in lockstep with the periods
+        j = 0
+        rate_count = len(rate_times)
+        for period_start_ts, period_start, period_end in periods:
             # Find the most recent rate that started before or at this period
-            for rate_time, rate_value in reversed(sorted_rates):
-                if rate_time <= period_start_iso:
-                    applicable_rate = rate_value
-                    break
-            
+            while j < rate_count and rate_times[j] <= period_start_ts:
+                j += 1
             # If no rate found before this period, use the first available rate
-            if applicable_rate is None and sorted_rates:
-                applicable_rate = sorted_rates[0][1]
+            applicable_rate = rate_values[j - 1] if j else rate_values[0]
             
-            if applicable_rate is not None:
-                formatted_rates.append({
-                    "start": period_start.isoformat(),
-                    "end": period_end.isoformat(),
-                    "value_inc_vat": round(applicable_rate / 100, 6),  # Convert pence to GBP
-                    "is_capped": False
-                })
-            
-            current_time = period_end
+            formatted_rates.append({
+                "start": period_start,
+                "end": period_end,
+                "value_inc_vat": round(applicable_rate / 100, 6),  # Convert pence to GBP
+                "is_capped": False
+            })
         
         # Return in chronological order (earliest first)
         return formatted_rates
-
-    def _get_current_rate(self, unit_rates: List[Dict]) -> float:
-        """Get the current rate from unit rates, preferring DIRECT_DEBIT with valid_to=null."""
-        from datetime import datetime, timezone
-        
-        if not unit_rates:
-            return None
-        
-        now = datetime.now(timezone.utc).isoformat()
-        
-        # Filter for DIRECT_DEBIT rates with valid_to=null (current ongoing rate)
-        current_rates = [
-            r for r in unit_rates 
-            if r.get("payment_method") == "DIRECT_DEBIT" 
-            and r.get("valid_to") is None
-            and r.get("valid_from") <= now
-        ]
-        
-        # If found, use the most recent one
-        if current_rates:
-            # Sort by valid_from descending to get the most recent
-            current_rates.sort(key=lambda x: x["valid_from"], reverse=True)
-            return round(float(current_rates[0]["value_inc_vat"]), 2)  # Return in pence
-        
-        # Fallback: find any valid rate for now
-        valid_rates = [
-            r for r in unit_rates
-            if r.get("valid_from") <= now
-            and (r.get("valid_to") is None or r.get("valid_to") > now)
-        ]
-        
-        if valid_rates:
-            # Prefer DIRECT_DEBIT, then sort by valid_from
-            valid_rates.sort(key=lambda x: (
-                x.get("payment_method") != "DIRECT_DEBIT",
-                -1 if x.get("valid_from") else 0
-            ), reverse=True)
-            return round(float(valid_rates[0]["value_inc_vat"]), 2)  # Return in pence
-        
-        return None
@@ -47,6 +47,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     except Exception as exc:
         _LOGGER.exception("Unexpected exception")
         raise CannotConnect from exc
+    finally:
+        api.close()
     
     # Return info that you want to store in the config entry.
     return {"title": f"Octopus Account {data[CONF_ACCOUNT_NUMBER]}"}
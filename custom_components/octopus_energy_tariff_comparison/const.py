@@ -13,13 +13,27 @@ CONF_REGION_CODE = "region_code"
 GRAPHQL_URL = "https://api.octopus.energy/v1/graphql/"
 REST_BASE_URL = "https://api.octopus.energy/v1"
 
-# Update interval (every 30 minutes)
-UPDATE_INTERVAL = 5
+# REST response cache lifetimes (in seconds)
+PRODUCTS_CACHE_TTL = 60 * 60
+PRODUCT_DETAILS_CACHE_TTL = 60 * 60
+
+# Update intervals: consumption is read half-hourly, while published rates
+# only change once a day (tomorrow's Agile rates appear around 16:00 UK time)
+CONSUMPTION_UPDATE_INTERVAL_MINUTES = 30
+RATES_UPDATE_INTERVAL_HOURS = 24
 
 # Tariffs to compare
-TARIFFS_TO_COMPARE = [
+TARIFFS_TO_COMPARE = (
     "Agile Octopus",
-    "Octopus Go", 
+    "Octopus Go",
     "Cosy Octopus",
-    "Flexible Octopus"
-]
+    "Flexible Octopus",
+)
+
+# Data and entity ID key of each tariff
+TARIFF_KEYS = {
+    "Agile Octopus": "agile_octopus",
+    "Octopus Go": "octopus_go",
+    "Cosy Octopus": "cosy_octopus",
+    "Flexible Octopus": "flexible_octopus",
+}
@@ -5,30 +5,97 @@ import logging
 from datetime import timedelta
 from typing import Any, Dict
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import OctopusEnergyAPI
-from .const import DOMAIN, UPDATE_INTERVAL
+from .api import UK_TZ, OctopusEnergyAPI
+from .const import CONSUMPTION_UPDATE_INTERVAL_MINUTES, DOMAIN, TARIFF_KEYS, TARIFFS_TO_COMPARE
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+# Seconds to hold refreshed data before writing it to storage
+STORAGE_SAVE_DELAY = 60
+
 
 class OctopusEnergyCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
 
-    def __init__(self, hass: HomeAssistant, config: Dict[str, str]) -> None:
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize my coordinator."""
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             # Name of the data. For logging purposes.
             name=DOMAIN,
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(minutes=UPDATE_INTERVAL),
+            update_interval=timedelta(minutes=CONSUMPTION_UPDATE_INTERVAL_MINUTES),
         )
-        self.api = OctopusEnergyAPI(config)
-        self.config = config
+        self.api = OctopusEnergyAPI(config_entry.data)
+        self.config = config_entry.data
+        # Data from the last run, kept across restarts so setup doesn't have to wait on the API
+        self._store = Store(hass, STORAGE_VERSION, self.storage_key(config_entry.entry_id))
+        self._use_stored_data = True
+        self._unsaved_data: Dict[str, Any] | None = None
+
+    @staticmethod
+    def storage_key(entry_id: str) -> str:
+        """Get the storage key of a config entry's cached data."""
+        return f"{DOMAIN}.{entry_id}"
+
+    async def _async_load_stored_data(self) -> Dict[str, Any] | None:
+        """Load the data stored by the last run, if it was fetched today (UK time)."""
+        try:
+            stored = await self._store.async_load()
+        except HomeAssistantError as err:
+            _LOGGER.warning("Ignoring unreadable cached tariff data: %s", err)
+            return None
+        
+        if not stored:
+            return None
+        
+        fetched_at = dt_util.parse_datetime(stored.get("fetched_at", ""))
+        if fetched_at is None or fetched_at.astimezone(UK_TZ).date() != dt_util.now(UK_TZ).date():
+            return None
+        
+        data = stored.get("data")
+        if data and "tariff_rates" in data:
+            # Fingerprints are salted hashes, so they are only valid in the process that made them
+            self._fingerprint_rates(data)
+        return data
+
+    def _take_unsaved_data(self) -> Dict[str, Any] | None:
+        """Hand the data waiting on the save delay to the store."""
+        data, self._unsaved_data = self._unsaved_data, None
+        return data
+
+    async def async_flush_stored_data(self) -> None:
+        """Write any data still waiting on the save delay, e.g. before the entry is unloaded."""
+        if (data := self._take_unsaved_data()) is not None:
+            await self._store.async_save(data)
+
+    def _fingerprint_rates(self, data: Dict[str, Any]) -> None:
+        """Fingerprint each tariff's rates so event entities can cheaply detect changes.
+
+        The previous list (and fingerprint) is reused when a tariff's rates are unchanged so
+        entities can skip it by identity.
+        """
+        previous_data = self.data or {}
+        previous_rates = previous_data.get("tariff_rates", {})
+        previous_fingerprints = previous_data.get("tariff_fingerprints", {})
+        fingerprints = {}
+        for tariff_key, rates in data["tariff_rates"].items():
+            if tariff_key in previous_fingerprints and rates == previous_rates.get(tariff_key):
+                data["tariff_rates"][tariff_key] = previous_rates[tariff_key]
+                fingerprints[tariff_key] = previous_fingerprints[tariff_key]
+            else:
+                fingerprints[tariff_key] = hash(tuple((rate["start"], rate["value_inc_vat"]) for rate in rates))
+        data["tariff_fingerprints"] = fingerprints
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch data from API endpoint.
@@ -36,10 +103,42 @@ class OctopusEnergyCoordinator(DataUpdateCoordinator):
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        # On startup, serve today's data from the last run and fetch fresh data in the background
+        if self._use_stored_data:
+            self._use_stored_data = False
+            if stored_data := await self._async_load_stored_data():
+                _LOGGER.debug("Using cached tariff data until the first refresh completes")
+                self.config_entry.async_create_background_task(
+                    self.hass, self.async_request_refresh(), f"{DOMAIN} initial refresh")
+                return stored_data
+        
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
             data = await self.hass.async_add_executor_job(self.api.get_tariff_data)
-            return data
+            fetched_at = dt_util.utcnow().isoformat()
+            if data:
+                data["last_updated"] = fetched_at
+            
+            # Convert costs and the current rate from pence to GBP once so sensors only look them up
+            for tariff in TARIFFS_TO_COMPARE:
+                tariff_key = TARIFF_KEYS[tariff]
+                if data.get(tariff_key) is not None:
+                    data[f"{tariff_key}_gbp"] = round(data[tariff_key] / 100, 2)
+            if "current_flexible_rate" in data:
+                data["current_flexible_rate_gbp"] = round(data["current_flexible_rate"] / 100, 4)
+            
+            # Fingerprint each tariff's rates once so event entities can cheaply detect changes
+            if "tariff_rates" in data:
+                self._fingerprint_rates(data)
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        
+        if data:
+            # Fingerprints are recomputed on load, so they aren't stored
+            self._unsaved_data = {
+                "fetched_at": fetched_at,
+                "data": {key: value for key, value in data.items() if key != "tariff_fingerprints"},
+            }
+            self._store.async_delay_save(self._take_unsaved_data, STORAGE_SAVE_DELAY)
+        return data
@@ -1,7 +1,6 @@
 """Event platform for Octopus Energy Tariff Comparison."""
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any
 
 from homeassistant.components.event import EventEntity, EventDeviceClass
@@ -10,9 +9,12 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, TARIFF_KEYS, TARIFFS_TO_COMPARE
 from .coordinator import OctopusEnergyCoordinator
 
+# Shared attributes for events without rates yet; Home Assistant never mutates them
+_EMPTY_RATES_ATTRS: dict = {"rates": []}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -23,18 +25,17 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     entities = [
-        OctopusAgileRatesEvent(coordinator),
-        OctopusGoRatesEvent(coordinator),
-        OctopusCosyRatesEvent(coordinator),
-        OctopusFlexibleRatesEvent(coordinator),
+        OctopusRatesEvent(coordinator, TARIFF_KEYS[tariff], f"{tariff} Rates")
+        for tariff in TARIFFS_TO_COMPARE
     ]
     
     async_add_entities(entities)
 
 
-class OctopusRatesEventBase(CoordinatorEntity, EventEntity):
-    """Base event entity for Octopus Energy rates."""
+class OctopusRatesEvent(CoordinatorEntity, EventEntity):
+    """Event entity for a tariff's Octopus Energy rates."""
 
+    _attr_icon = "mdi:cash-clock"
     _attr_event_types = ["rates_updated"]
 
     def __init__(
@@ -50,65 +51,37 @@ class OctopusRatesEventBase(CoordinatorEntity, EventEntity):
         self._attr_unique_id = f"{coordinator.config['account_number']}_{tariff_key}_rates"
         self._attr_has_entity_name = True
         self._last_rates_update = None
+        self._last_rates = None
+        self._attr_extra_state_attributes = self._build_rates_attributes()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data and "tariff_rates" in self.coordinator.data:
-            rates = self.coordinator.data["tariff_rates"].get(self.tariff_key)
+        data = self.coordinator.data
+        if data and "tariff_rates" in data:
+            rates = data["tariff_rates"].get(self.tariff_key)
             if rates:
+                # The coordinator keeps the same list object while a tariff's rates are unchanged
+                if rates is self._last_rates:
+                    return
+                self._last_rates = rates
+                
                 # Trigger event when rates are updated
-                current_update = str(rates)
+                current_update = data["tariff_fingerprints"][self.tariff_key]
                 if current_update != self._last_rates_update:
                     self._trigger_event("rates_updated", {"rates": rates})
                     self._last_rates_update = current_update
+                    self._attr_extra_state_attributes = self._build_rates_attributes()
                     self.async_write_ha_state()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        if self.coordinator.data and "tariff_rates" in self.coordinator.data:
-            rates = self.coordinator.data["tariff_rates"].get(self.tariff_key, [])
+    def _build_rates_attributes(self) -> dict[str, Any]:
+        """Build the state attributes from the coordinator data, cached until the rates change."""
+        data = self.coordinator.data
+        if data and "tariff_rates" in data:
+            rates = data["tariff_rates"].get(self.tariff_key, [])
             return {
                 "rates": rates,
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": data.get("last_updated"),
                 "rate_count": len(rates)
             }
-        return {"rates": []}
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the event."""
-        return "mdi:cash-clock"
-
-
-class OctopusAgileRatesEvent(OctopusRatesEventBase):
-    """Agile Octopus rates event entity."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the event entity."""
-        super().__init__(coordinator, "agile_octopus", "Agile Octopus Rates")
-
-
-class OctopusGoRatesEvent(OctopusRatesEventBase):
-    """Octopus Go rates event entity."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the event entity."""
-        super().__init__(coordinator, "octopus_go", "Octopus Go Rates")
-
-
-class OctopusCosyRatesEvent(OctopusRatesEventBase):
-    """Cosy Octopus rates event entity."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the event entity."""
-        super().__init__(coordinator, "cosy_octopus", "Cosy Octopus Rates")
-
-
-class OctopusFlexibleRatesEvent(OctopusRatesEventBase):
-    """Flexible Octopus rates event entity."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the event entity."""
-        super().__init__(coordinator, "flexible_octopus", "Flexible Octopus Rates")
+        return _EMPTY_RATES_ATTRS
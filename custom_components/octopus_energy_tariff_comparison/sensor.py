@@ -8,14 +8,17 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, TARIFF_KEYS, TARIFFS_TO_COMPARE
 from .coordinator import OctopusEnergyCoordinator
 
+# Shared attributes for sensors without data yet; Home Assistant never mutates them
+_EMPTY_ATTRS: dict = {}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -30,10 +33,7 @@ async def async_setup_entry(
         OctopusTotalConsumptionSensor(coordinator),
         OctopusReadingsCountSensor(coordinator),
         OctopusCurrentFlexibleRateSensor(coordinator),
-        OctopusAgileCostSensor(coordinator),
-        OctopusGoCostSensor(coordinator),
-        OctopusCosyCostSensor(coordinator),
-        OctopusFlexibleCostSensor(coordinator),
+        *(OctopusCostSensor(coordinator, tariff) for tariff in TARIFFS_TO_COMPARE),
     ]
     
     async_add_entities(entities)
@@ -48,11 +48,28 @@ class OctopusBaseSensor(CoordinatorEntity, SensorEntity):
         self.sensor_key = sensor_key
         self._attr_name = name
         self._attr_unique_id = f"{coordinator.config['account_number']}_{sensor_key}"
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
+        self._last_written_state = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, only writing the state when it changed."""
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
+        state = (self.available, self.native_value, self._attr_extra_state_attributes)
+        if state != self._last_written_state:
+            self._last_written_state = state
+            self.async_write_ha_state()
+
+    def _build_extra_state_attributes(self) -> dict | None:
+        """Build the state attributes from the coordinator data, cached until the next update."""
+        return None
 
 
 class OctopusCurrentTariffSensor(OctopusBaseSensor):
     """Current tariff name sensor."""
 
+    _attr_icon = "mdi:lightning-bolt"
+
     def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, "current_tariff_name", "Current Tariff")
@@ -61,14 +78,10 @@ class OctopusCurrentTariffSensor(OctopusBaseSensor):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("current_tariff_name")
-        return None
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:lightning-bolt"
+        data = self.coordinator.data
+        if not data:
+            return None
+        return data.get("current_tariff_name")
 
 
 class OctopusTotalConsumptionSensor(OctopusBaseSensor):
@@ -85,14 +98,17 @@ class OctopusTotalConsumptionSensor(OctopusBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("total_consumption")
-        return None
+        data = self.coordinator.data
+        if not data:
+            return None
+        return data.get("total_consumption")
 
 
 class OctopusReadingsCountSensor(OctopusBaseSensor):
     """Number of readings sensor."""
 
+    _attr_icon = "mdi:counter"
+
     def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, "number_of_readings", "Number of Readings")
@@ -101,19 +117,17 @@ class OctopusReadingsCountSensor(OctopusBaseSensor):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("number_of_readings")
-        return None
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:counter"
+        data = self.coordinator.data
+        if not data:
+            return None
+        return data.get("number_of_readings")
 
 
 class OctopusCurrentFlexibleRateSensor(OctopusBaseSensor):
     """Current Flexible Octopus rate sensor."""
 
+    _attr_icon = "mdi:flash"
+
     def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, "current_flexible_rate", "Current Flexible Rate")
@@ -125,70 +139,33 @@ class OctopusCurrentFlexibleRateSensor(OctopusBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("current_flexible_rate")
-        return None
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:flash"
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        if self.coordinator.data and "current_flexible_rate" in self.coordinator.data:
-            rate_pence = self.coordinator.data.get("current_flexible_rate", 0)
+        data = self.coordinator.data
+        if not data:
+            return None
+        return data.get("current_flexible_rate")
+
+    def _build_extra_state_attributes(self) -> dict:
+        """Build extra state attributes."""
+        data = self.coordinator.data
+        if data and "current_flexible_rate" in data:
             return {
-                "rate_gbp": round(rate_pence / 100, 4),
+                "rate_gbp": data["current_flexible_rate_gbp"],
                 "tariff_type": "Flexible Octopus"
             }
-        return {}
-
-
-class OctopusAgileCostSensor(OctopusBaseSensor):
-    """Agile Octopus cost sensor."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, "agile_octopus_cost", "Agile Octopus Cost Today")
-        self._attr_device_class = SensorDeviceClass.MONETARY
-        self._attr_state_class = SensorStateClass.TOTAL
-        self._attr_native_unit_of_measurement = "GBP"
-        self._attr_suggested_display_precision = 2
+        return _EMPTY_ATTRS
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        if self.coordinator.data:
-            cost_pence = self.coordinator.data.get("agile_octopus")
-            if cost_pence is not None:
-                return round(cost_pence / 100, 2)
-        return None
 
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:cash"
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        if self.coordinator.data and "agile_octopus" in self.coordinator.data:
-            cost_pence = self.coordinator.data.get("agile_octopus", 0)
-            return {
-                "cost_pence": round(cost_pence, 2),
-                "tariff_type": "Agile Octopus"
-            }
-        return {}
+class OctopusCostSensor(OctopusBaseSensor):
+    """Tariff cost sensor."""
 
+    _attr_icon = "mdi:cash"
 
-class OctopusGoCostSensor(OctopusBaseSensor):
-    """Octopus Go cost sensor."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
+    def __init__(self, coordinator: OctopusEnergyCoordinator, tariff: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, "octopus_go_cost", "Octopus Go Cost Today")
+        self.tariff = tariff
+        self.tariff_key = TARIFF_KEYS[tariff]
+        self._cost_gbp_key = f"{self.tariff_key}_gbp"
+        super().__init__(coordinator, f"{self.tariff_key}_cost", f"{tariff} Cost Today")
         self._attr_device_class = SensorDeviceClass.MONETARY
         self._attr_state_class = SensorStateClass.TOTAL
         self._attr_native_unit_of_measurement = "GBP"
@@ -197,98 +174,17 @@ class OctopusGoCostSensor(OctopusBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            cost_pence = self.coordinator.data.get("octopus_go")
-            if cost_pence is not None:
-                return round(cost_pence / 100, 2)
-        return None
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:cash"
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        if self.coordinator.data and "octopus_go" in self.coordinator.data:
-            cost_pence = self.coordinator.data.get("octopus_go", 0)
+        data = self.coordinator.data
+        if not data:
+            return None
+        return data.get(self._cost_gbp_key)
+
+    def _build_extra_state_attributes(self) -> dict:
+        """Build extra state attributes."""
+        data = self.coordinator.data
+        if data and self.tariff_key in data:
             return {
-                "cost_pence": round(cost_pence, 2),
-                "tariff_type": "Octopus Go"
-            }
-        return {}
-
-
-class OctopusCosyCostSensor(OctopusBaseSensor):
-    """Cosy Octopus cost sensor."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, "cosy_octopus_cost", "Cosy Octopus Cost Today")
-        self._attr_device_class = SensorDeviceClass.MONETARY
-        self._attr_state_class = SensorStateClass.TOTAL
-        self._attr_native_unit_of_measurement = "GBP"
-        self._attr_suggested_display_precision = 2
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        if self.coordinator.data:
-            cost_pence = self.coordinator.data.get("cosy_octopus")
-            if cost_pence is not None:
-                return round(cost_pence / 100, 2)
-        return None
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:cash"
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        if self.coordinator.data and "cosy_octopus" in self.coordinator.data:
-            cost_pence = self.coordinator.data.get("cosy_octopus", 0)
-            return {
-                "cost_pence": round(cost_pence, 2),
-                "tariff_type": "Cosy Octopus"
-            }
-        return {}
-
-
-class OctopusFlexibleCostSensor(OctopusBaseSensor):
-    """Flexible Octopus cost sensor."""
-
-    def __init__(self, coordinator: OctopusEnergyCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, "flexible_octopus_cost", "Flexible Octopus Cost Today")
-        self._attr_device_class = SensorDeviceClass.MONETARY
-        self._attr_state_class = SensorStateClass.TOTAL
-        self._attr_native_unit_of_measurement = "GBP"
-        self._attr_suggested_display_precision = 2
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        if self.coordinator.data:
-            cost_pence = self.coordinator.data.get("flexible_octopus")
-            if cost_pence is not None:
-                return round(cost_pence / 100, 2)
-        return None
-
-    @property
-    def icon(self) -> str:
-        """Return the icon of the sensor."""
-        return "mdi:cash"
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        if self.coordinator.data and "flexible_octopus" in self.coordinator.data:
-            cost_pence = self.coordinator.data.get("flexible_octopus", 0)
-            return {
-                "cost_pence": round(cost_pence, 2),
-                "tariff_type": "Flexible Octopus"
+                "cost_pence": round(data[self.tariff_key], 2),
+                "tariff_type": self.tariff
             }
-        return {}
+        return _EMPTY_ATTRS